@@ -1,13 +1,30 @@
-from fastapi import FastAPI, File, UploadFile, HTTPException
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from fastapi import FastAPI, File, Response, UploadFile, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
-from typing import List
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, Field, TypeAdapter
+from typing import Any, Dict, List
 from logic.speechToText import transcribe_with_elevenlabs
-from logic.promptPicker import get_prompt_for_today
+from logic.promptPicker import get_prompt_for_date
 from logic.insightEngine import generate_weekly_insights
 
+# process pool for CPU-bound signal extraction, owned by the app lifespan.
+# One pool per uvicorn worker, so keep it small (CPU_POOL_WORKERS, default 1).
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.cpu_pool = ProcessPoolExecutor(max_workers=int(os.getenv("CPU_POOL_WORKERS", "1")))
+    try:
+        yield
+    finally:
+        app.state.cpu_pool.shutdown()
+
 # create FastAPI app
-app = FastAPI(title="Self-Discovery Backend")
+app = FastAPI(title="Self-Discovery Backend", lifespan=lifespan)
 
 # allow React dev server (Vite default is 5173)
 app.add_middleware(
@@ -21,6 +38,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# compress larger JSON bodies (e.g. weekly insights); small responses skip it
+app.add_middleware(GZipMiddleware, minimum_size=512, compresslevel=5)
+
+# max accepted audio upload
+MAX_AUDIO_BYTES = 25 * 1024 * 1024
+
 # -----------------------
 # Models 
 # -----------------------
@@ -30,19 +53,27 @@ class Entry(BaseModel):
     timestamp: int  # ms since epoch
 
 class WeeklyInsightRequest(BaseModel):
-    entries: List[Entry]
+    entries: List[Entry] = Field(..., max_length=500)
+
+# dumps the whole entries list in one call into the Rust core
+_ENTRIES_ADAPTER = TypeAdapter(List[Entry])
 
 # -----------------------
 # Endpoints
 # -----------------------
 # test endpoint
 @app.get("/health")
-def health():
+async def health():
     return {"status": "ok"}
 
+# the prompt only changes once per day, so memoize it keyed by date
+@lru_cache(maxsize=1)
+def _prompt_for_day(day: date) -> Dict[str, Any]:
+    return dict(get_prompt_for_date(day))
+
 # Endpoint to get today's prompt
 @app.get("/prompt/today")
-def prompt_today():
+async def prompt_today(response: Response):
     """
     Returns:
       {
@@ -53,17 +84,22 @@ def prompt_today():
         }
       }
     """
-    return {"prompt": get_prompt_for_today()}
+    now = datetime.now()
+    # let the browser reuse it for up to an hour, but never past midnight
+    midnight = datetime.combine(now.date() + timedelta(days=1), time.min)
+    max_age = min(3600, int((midnight - now).total_seconds()))
+    response.headers["Cache-Control"] = f"public, max-age={max_age}"
+    return {"prompt": _prompt_for_day(now.date())}
 
 # Endpoint to get weekly insights
 @app.post("/insights/weekly")
-def insights_weekly(payload: WeeklyInsightRequest):
+async def insights_weekly(payload: WeeklyInsightRequest):
     """
     Frontend loads entries from LocalStorage and sends them here.
     Backend returns computed signals + Gemini-generated report (or fallback).
     """
-    entries_as_dicts = [e.model_dump() for e in payload.entries]
-    return generate_weekly_insights(entries_as_dicts)
+    entries_as_dicts = _ENTRIES_ADAPTER.dump_python(payload.entries)
+    return await generate_weekly_insights(entries_as_dicts, executor=app.state.cpu_pool)
 
 # Endpoint for speech-to-text transcription
 @app.post("/stt/transcribe")
@@ -76,13 +112,24 @@ async def stt_transcribe(file: UploadFile = File(...), language_code: str | None
     if not file.content_type or not file.content_type.startswith(("audio/", "video/")):
         raise HTTPException(status_code=400, detail=f"Unsupported content type: {file.content_type}")
 
-    audio_bytes = await file.read()
-    if not audio_bytes:
+    # The upload is already spooled (to disk past 1 MB); check its real size and
+    # hand the file object itself to the STT client instead of reading it into memory
+    audio_file = file.file
+    size = file.size
+    if size is None:
+        size = audio_file.seek(0, os.SEEK_END)
+    if size > MAX_AUDIO_BYTES:
+        raise HTTPException(status_code=413, detail="Audio file too large")
+    if size == 0:
         raise HTTPException(status_code=400, detail="Empty audio file")
+    audio_file.seek(0)
 
+    # The ElevenLabs client is synchronous (HTTP call + reading the spooled file),
+    # so run it in the threadpool to keep the event loop serving other requests
     try:
-        text = transcribe_with_elevenlabs(
-            audio_bytes,
+        text = await run_in_threadpool(
+            transcribe_with_elevenlabs,
+            audio_file,
             filename=file.filename or "audio.webm",
             language_code=language_code,
         )
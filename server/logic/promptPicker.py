@@ -13,7 +13,14 @@ Usage:
 import json
 from pathlib import Path
 from datetime import date
-from typing import Dict, List, Any
+from types import MappingProxyType
+from typing import Dict, List, Any, Mapping, Tuple
+
+# orjson parses straight from bytes in C; stdlib json (which also accepts bytes) is the fallback
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
 
 #--- Constants ---
 CATEGORIES: List[str] = ["values", "emotions", "identity", "growth", "relationships"]
@@ -27,7 +34,7 @@ def _load_prompts_by_category() -> Dict[str, List[Dict[str, Any]]]:
     if not PROMPTS_PATH.exists():
         raise FileNotFoundError(f"prompts.json not found at: {PROMPTS_PATH}")
 
-    data = json.loads(PROMPTS_PATH.read_text(encoding="utf-8"))
+    data = _json_loads(PROMPTS_PATH.read_bytes())
 
     # Basic validation and normalization
     prompts_by_cat: Dict[str, List[Dict[str, Any]]] = {}
@@ -83,22 +90,28 @@ def _prompt_index_for_date(d: date, category: str) -> int:
     return cycle_num % len(prompts)
 
 
+# --- Precomputed response entries ---
+# The final {"id", "category", "prompt"} dict for every prompt is built once at
+# import (memory grows with the number of prompts), so a lookup is two indexes
+# and no per-request allocation. Entries are read-only views since they are shared.
+_ENTRIES_BY_CATEGORY: Dict[str, Tuple[Mapping[str, Any], ...]] = {
+    cat: tuple(
+        MappingProxyType({"id": p["id"], "category": cat, "prompt": p["prompt"]})
+        for p in PROMPTS_BY_CATEGORY[cat]
+    )
+    for cat in CATEGORIES
+}
+
+
 # --- Public API ---
-def get_prompt_for_date(d: date) -> Dict[str, Any]:
+def get_prompt_for_date(d: date) -> Mapping[str, Any]:
     """
-    Returns:
+    Returns (read-only):
       {"id": "...", "category": "...", "prompt": "..."}
     """
     category = _category_for_date(d)
-    idx = _prompt_index_for_date(d, category)
-    chosen = PROMPTS_BY_CATEGORY[category][idx]
-
-    return {
-        "id": chosen["id"],
-        "category": category,
-        "prompt": chosen["prompt"],
-    }
+    return _ENTRIES_BY_CATEGORY[category][_prompt_index_for_date(d, category)]
 
 
-def get_prompt_for_today() -> Dict[str, Any]:
+def get_prompt_for_today() -> Mapping[str, Any]:
     return get_prompt_for_date(date.today())
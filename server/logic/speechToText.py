@@ -1,15 +1,17 @@
 import os
-from io import BytesIO
+from typing import BinaryIO
 from elevenlabs.client import ElevenLabs
 
 def transcribe_with_elevenlabs(
-    audio_bytes: bytes,
+    audio: bytes | BinaryIO,
     *,
     filename: str = "audio.webm",
     language_code: str | None = None,  # e.g. "eng" or None for auto-detect
 ) -> str:
     """
     Calls ElevenLabs Speech-to-Text (Scribe v2) and returns plain text.
+    `audio` may be raw bytes or a binary file object (e.g. an upload's
+    spooled file), which is streamed as-is without copying into memory.
     """
     api_key = os.getenv("ELEVENLABS_API_KEY")
     if not api_key:
@@ -17,11 +19,8 @@ def transcribe_with_elevenlabs(
 
     client = ElevenLabs(api_key=api_key)
 
-    audio_file = BytesIO(audio_bytes)
-    audio_file.name = filename  # some libs use name for file type hints
-
     transcription = client.speech_to_text.convert(
-        file=audio_file,
+        file=(filename, audio),  # filename gives the API a file type hint
         model_id="scribe_v2",
         language_code=language_code,     # None = auto-detect :contentReference[oaicite:2]{index=2}
         diarize=False,                   # keep simple for hackathon